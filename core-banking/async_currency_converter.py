@@ -0,0 +1,196 @@
+import asyncio
+import typing
+
+import aiohttp
+import orjson
+from base_converter import BaseCurrencyConverter, _INVALID_URL_MESSAGE
+
+
+class AsyncCurrencyConverter(BaseCurrencyConverter):
+    """
+    asyncio counterpart of CurrencyConverter. Lookups for several currency pairs
+    run concurrently over a single pooled aiohttp session.
+    """
+    # Upper bound on the number of requests in flight at once from get_many()
+    CONCURRENCY = 10
+    # ClientConnectionError also covers mid-request failures (ServerDisconnectedError, ClientOSError), matching
+    # what requests reports as ConnectionError in the synchronous converter; a truncated body is a ClientPayloadError
+    _EXC_TO_TYPE = (
+        (aiohttp.ClientResponseError, "http-error", None),
+        (asyncio.TimeoutError, "timeout", "The request to the currency API timed out."),
+        (aiohttp.ClientConnectionError, "network-error", "A network connection error occurred to the currency API."),
+        (aiohttp.ClientPayloadError, "network-error", "A network connection error occurred to the currency API."),
+        # InvalidURL is also a ValueError, so it must come before the JSON decoding row
+        (aiohttp.InvalidURL, "invalid-url", _INVALID_URL_MESSAGE),
+        (getattr(aiohttp, 'NonHttpUrlClientError', aiohttp.InvalidURL), "invalid-url", _INVALID_URL_MESSAGE),
+        (ValueError, "json-decode-error", "Failed to decode the JSON response from the API."),
+    )
+
+    def __init__(self, api_key: str):
+        super().__init__(api_key)
+        # The aiohttp session must be created inside a running event loop, so it is opened lazily
+        self._session: typing.Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT_SECONDS),
+                connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Closes the underlying HTTP session and releases pooled connections.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _make_api_request(self, endpoint: str) -> dict:
+        """
+        Internal helper to make API requests. Raises ExchangeRateAPIError on any failure.
+        Mirrors the error handling of CurrencyConverter._make_api_request.
+        """
+        cached = self._get_cached(endpoint)
+        if cached is not None:
+            return cached
+
+        stale_entry, headers = self._prepare_request(endpoint)
+        full_url = self._url_prefix + endpoint
+        session = self._get_session()
+
+        try:
+            async with session.get(full_url, headers=headers) as response:
+                # 304 Not Modified: the cached copy is still current and there is no body to parse
+                if response.status == 304 and stale_entry is not None:
+                    return self._revalidated(endpoint, stale_entry, response.headers)
+                # Raises ClientResponseError for 4xx/5xx responses
+                response.raise_for_status()
+                # Raises orjson.JSONDecodeError (a ValueError) if the response isn't JSON
+                data = orjson.loads(await response.read())
+
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            if isinstance(e, aiohttp.ClientResponseError):
+                raise self._request_error(endpoint, e, e.status, e.message, e.headers) from e
+            raise self._request_error(endpoint, e, None, None, None) from e
+
+        return self._handle_api_response(endpoint, data, response.status, response.headers)
+
+    async def _ensure_codes(self) -> None:
+        """
+        Loads the set of currency codes supported by the API. Currencies rarely
+        change, so the set is kept for the lifetime of the converter.
+        """
+        if self._supported_codes is None:
+            self._store_codes(await self._make_api_request('/codes'))
+
+    async def _check_supported(self, *currency_codes: str) -> None:
+        """
+        Rejects currency codes that the API does not support without making a
+        request for them. Raises ExchangeRateAPIError with api_error_type 'unsupported-code'.
+        """
+        await self._ensure_codes()
+        self._reject_unsupported(currency_codes)
+
+    async def get_exchange_rate(self, base_currency: str, target_currency: str) -> float:
+        """
+        Fetches the exchange rate. Raises ExchangeRateAPIError on failure.
+        """
+        base_currency, target_currency = base_currency.upper(), target_currency.upper()
+        await self._check_supported(base_currency, target_currency)
+        rate = self._cached_pair_rate(base_currency, target_currency)
+        if rate is not None:
+            return rate
+        data = await self._make_api_request(f'/pair/{base_currency}/{target_currency}')
+        return data['conversion_rate']
+
+    async def get_all_rates(self, base_currency: str) -> typing.Dict[str, float]:
+        """
+        Fetches the rates from base_currency to every supported currency.
+        Raises ExchangeRateAPIError on failure.
+        """
+        base_currency = base_currency.upper()
+        await self._check_supported(base_currency)
+        data = await self._make_api_request(f'/latest/{base_currency}')
+        # A copy, so callers can't alter the cached table that later lookups read from
+        return dict(data['conversion_rates'])
+
+    async def get_exchange_rates(self, base_currency: str, target_currencies: typing.Iterable[str]) -> typing.Dict[str, float]:
+        """
+        Fetches the rates from base_currency to each of target_currencies with a single
+        /latest request, keyed by upper-cased currency code. Raises ExchangeRateAPIError on failure.
+        """
+        target_currencies = [code.upper() for code in target_currencies]
+        await self._check_supported(*target_currencies)
+        rates = await self.get_all_rates(base_currency)
+        return self._select_rates(rates, target_currencies)
+
+    async def get_many(self, pairs: typing.Iterable[typing.Tuple[str, str]]) -> typing.List[float]:
+        """
+        Fetches the exchange rate for every (base, target) pair concurrently.
+        Results are returned in the same order as the pairs.
+        """
+        # Load the supported codes once up front rather than in every concurrent lookup
+        await self._ensure_codes()
+        semaphore = asyncio.Semaphore(self.CONCURRENCY)
+
+        async def bounded(base_currency: str, target_currency: str) -> float:
+            async with semaphore:
+                return await self.get_exchange_rate(base_currency, target_currency)
+
+        return await asyncio.gather(*(bounded(b, t) for b, t in pairs))
+
+
+if __name__ == "__main__":
+    # --- Offline Checks (local stub server, no API key needed) ---
+    # The same stateful paths as the offline checks in currency_converter.py, through aiohttp.
+    from exceptions import ExchangeRateAPIError
+    from stub_api_server import StubAPIServer, OfflineChecks
+
+    print("\n--- Offline checks for AsyncCurrencyConverter against a local stub server ---")
+    offline = OfflineChecks()
+
+    async def run_offline_checks(stub: StubAPIServer) -> None:
+        async with AsyncCurrencyConverter("OFFLINE_KEY") as converter:
+            converter.BASE_URL = stub.base_url
+
+            # [O1] Several targets come from one /latest request, and concurrent pairs reuse it
+            print("\n[O1] Fetching USD->EUR and USD->GBP, then the same pairs concurrently...")
+            rates = await converter.get_exchange_rates("usd", ["eur", "gbp"])
+            offline.check("batch lookup", rates == {"EUR": 0.9, "GBP": 0.8}, f"rates: {rates}")
+            many = await converter.get_many([("usd", "eur"), ("usd", "gbp")])
+            offline.check("concurrent pairs served from cache", many == [0.9, 0.8]
+                          and stub.hits_for('/latest/USD') == [200], f"rates: {many}")
+
+            # [O2] After the TTL expires, the stale entry is revalidated and a 304 keeps the cached data
+            print("\n[O2] Revalidating the USD table once its TTL has expired...")
+            converter.CACHE_TTL_SECONDS = 0
+            data = await converter._make_api_request("/latest/USD")
+            converter.CACHE_TTL_SECONDS = AsyncCurrencyConverter.CACHE_TTL_SECONDS
+            offline.check("stale entry revalidated with 304", stub.hits_for('/latest/USD') == [200, 304]
+                          and data["conversion_rates"]["EUR"] == 0.9, f"hits: {stub.hits_for('/latest/USD')}")
+
+            # [O3] A 429 is reported as quota-reached at once, and later calls fail fast without a request
+            print("\n[O3] Requesting EUR rates while the quota is exhausted...")
+            for attempt in ("first", "second"):
+                try:
+                    await converter.get_all_rates("EUR")
+                    offline.check(f"{attempt} call raised quota-reached", False, "no error raised")
+                except ExchangeRateAPIError as e:
+                    offline.check(f"{attempt} call raised quota-reached", e.api_error_type == "quota-reached",
+                                  f"type: {e.api_error_type}, status: {e.http_status_code}")
+            offline.check("429 was not retried", stub.hits_for('/latest/EUR') == [429],
+                          f"hits: {stub.hits_for('/latest/EUR')}")
+
+    with StubAPIServer() as stub_server:
+        asyncio.run(run_offline_checks(stub_server))
+
+    offline.finish()
+    print("\n--- Offline checks complete ---")
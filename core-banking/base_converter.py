@@ -0,0 +1,263 @@
+import collections
+import time
+import typing
+
+from exceptions import ExchangeRateAPIError, API_ERROR_MESSAGES, DEFAULT_API_ERROR_MESSAGE
+
+_REDACTED_API_KEY = '***REDACTED_API_KEY***'
+_INVALID_URL_MESSAGE = "The currency API URL is invalid. Please check BASE_URL."
+
+
+class BaseCurrencyConverter:
+    """
+    Transport-independent state and response handling shared by CurrencyConverter
+    and AsyncCurrencyConverter: the response cache and its HTTP validators, quota
+    tracking, supported-code checks and mapping of failures to ExchangeRateAPIError.
+    Subclasses only implement the HTTP call itself.
+    """
+    BASE_URL = "https://v6.exchangerate-api.com/v6/"
+    # Rates on the API update roughly hourly, so successful responses are reused for this long
+    CACHE_TTL_SECONDS = 3600
+    # Stale entries are kept for revalidation, so the cache is bounded and evicts least recently used
+    CACHE_MAXSIZE = 128
+    # Seconds allowed for a single HTTP request
+    REQUEST_TIMEOUT_SECONDS = 10
+    # (exception type, api_error_type, message template) checked in order; a None template is
+    # chosen from the HTTP status. Filled in by each subclass for its HTTP library.
+    _EXC_TO_TYPE: typing.Tuple[typing.Tuple[typing.Union[type, typing.Tuple[type, ...]], str, typing.Optional[str]], ...] = ()
+
+    def __init__(self, api_key: str):
+        # Fetched once from /codes (or taken from the first rates table) so bad codes are rejected locally
+        self._supported_codes: typing.Optional[typing.Set[str]] = None
+        # (BASE_URL, api_key) the cached URL prefixes were built from
+        self._prefix_source: typing.Optional[typing.Tuple[str, str]] = None
+        self._prefixes: typing.Tuple[str, str] = ('', '')
+        # Also resets the response cache and quota state
+        self.api_key = api_key
+
+    @property
+    def api_key(self) -> str:
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, value: str) -> None:
+        self._api_key = value
+        # Cached responses and the quota belong to the previous key
+        # endpoint -> (time.monotonic() when stored, response data, Last-Modified, ETag)
+        self._cache: typing.OrderedDict[str, typing.Tuple[float, dict, typing.Optional[str], typing.Optional[str]]] = \
+            collections.OrderedDict()
+        # time.monotonic() until which the API quota is known to be exhausted
+        self._quota_reset_at: typing.Optional[float] = None
+
+    def _url_prefixes(self) -> typing.Tuple[str, str]:
+        """
+        Returns the request and redacted URL prefixes, rebuilding them only when BASE_URL
+        (on the instance or the class) or the key has changed since the last call.
+        """
+        source = (self.BASE_URL, self._api_key)
+        if source != self._prefix_source:
+            self._prefix_source = source
+            self._prefixes = (f'{source[0]}{source[1]}', f'{source[0]}{_REDACTED_API_KEY}')
+        return self._prefixes
+
+    @property
+    def _url_prefix(self) -> str:
+        return self._url_prefixes()[0]
+
+    @property
+    def _redacted_prefix(self) -> str:
+        return self._url_prefixes()[1]
+
+    def _get_cached(self, endpoint: str) -> typing.Optional[dict]:
+        """
+        Returns the cached response for an endpoint if it is younger than CACHE_TTL_SECONDS.
+        """
+        entry = self._cache.get(endpoint)
+        if entry and time.monotonic() - entry[0] < self.CACHE_TTL_SECONDS:
+            self._cache.move_to_end(endpoint)
+            return entry[1]
+        return None
+
+    def _store(self, endpoint: str, data: dict, last_modified: typing.Optional[str],
+               etag: typing.Optional[str]) -> None:
+        """
+        Caches a response, evicting the least recently used entry beyond CACHE_MAXSIZE.
+        """
+        self._cache[endpoint] = (time.monotonic(), data, last_modified, etag)
+        self._cache.move_to_end(endpoint)
+        if len(self._cache) > self.CACHE_MAXSIZE:
+            self._cache.popitem(last=False)
+
+    def _revalidated(self, endpoint: str, stale_entry: tuple, headers: typing.Mapping[str, str]) -> dict:
+        """
+        Restarts the TTL of a cached entry after the server answered 304 Not Modified.
+        """
+        _, data, last_modified, etag = stale_entry
+        self._store(endpoint, data, headers.get('Last-Modified', last_modified), headers.get('ETag', etag))
+        return data
+
+    def _note_quota_reset(self, headers: typing.Optional[typing.Mapping[str, str]]) -> None:
+        """
+        Records when an exhausted quota resets, from the seconds in the x-ratelimit-reset
+        header, falling back to a numeric Retry-After.
+        """
+        if headers is None:
+            return
+        reset = headers.get('x-ratelimit-reset') or headers.get('Retry-After')
+        try:
+            self._quota_reset_at = time.monotonic() + float(reset)
+        except (TypeError, ValueError):
+            pass
+
+    def _prepare_request(self, endpoint: str) -> typing.Tuple[typing.Optional[tuple], typing.Dict[str, str]]:
+        """
+        Runs the pre-network checks for an endpoint that isn't freshly cached. Returns the
+        stale cache entry (if any) and the conditional headers to revalidate it with.
+        """
+        # Fail fast while the quota is known to be exhausted instead of spending a request on it
+        if self._quota_reset_at is not None:
+            retry_after = self._quota_reset_at - time.monotonic()
+            if retry_after > 0:
+                raise ExchangeRateAPIError(
+                    message_template=API_ERROR_MESSAGES["quota-reached"],
+                    api_error_type="quota-reached",
+                    details={"retry_after_seconds": retry_after}
+                )
+            self._quota_reset_at = None
+
+        # A stale entry is revalidated with its validators instead of being refetched blindly
+        stale_entry = self._cache.get(endpoint)
+        headers = {}
+        if stale_entry is not None:
+            if stale_entry[2]:
+                headers['If-Modified-Since'] = stale_entry[2]
+            if stale_entry[3]:
+                headers['If-None-Match'] = stale_entry[3]
+        return stale_entry, headers
+
+    def _request_error(self, endpoint: str, e: Exception, status_code: typing.Optional[int],
+                       reason: typing.Optional[str],
+                       headers: typing.Optional[typing.Mapping[str, str]]) -> ExchangeRateAPIError:
+        """
+        Builds the ExchangeRateAPIError for a network, HTTP or JSON decoding failure.
+        The status code, reason and headers come from the failed response, if there was one.
+        """
+        details = {"requested_url_redacted": self._redacted_prefix + endpoint}
+
+        # Too Many Requests is the quota running out, so report it the same way as the later fast-fail errors
+        if status_code == 429:
+            self._note_quota_reset(headers)
+            return ExchangeRateAPIError(
+                message_template=API_ERROR_MESSAGES["quota-reached"],
+                api_error_type="quota-reached",
+                http_status_code=status_code,
+                details=details
+            )
+
+        message_args = ()
+        for exc_type, api_error_type, message_template in self._EXC_TO_TYPE:
+            if isinstance(e, exc_type):
+                break
+        else:
+            api_error_type = "unknown-request-error"
+            # Some client errors embed the full request URL, so the key is redacted from the text
+            error_text = str(e)
+            if self.api_key:
+                error_text = error_text.replace(self.api_key, _REDACTED_API_KEY)
+            message_template, message_args = "An unexpected error occurred: %s", (error_text,)
+
+        if message_template is None:
+            if status_code == 404:
+                message_template = "The requested currency or API endpoint was not found."
+            else:
+                message_template = "API request failed with HTTP Error %s: %s."
+                message_args = (status_code, reason)
+
+        return ExchangeRateAPIError(
+            message_template=message_template,
+            api_error_type=api_error_type,
+            http_status_code=status_code,
+            details=details,
+            message_args=message_args
+        )
+
+    def _handle_api_response(self, endpoint: str, data: dict, status_code: int,
+                             headers: typing.Mapping[str, str]) -> dict:
+        """
+        Interprets the API's own 'result' field of a decoded response. Successful responses
+        are cached and returned; API-reported errors raise ExchangeRateAPIError.
+        """
+        if data.get('result') == 'success':
+            self._store(endpoint, data, headers.get('Last-Modified'), headers.get('ETag'))
+            if self._supported_codes is None and 'conversion_rates' in data:
+                self._supported_codes = set(data['conversion_rates'])
+            return data
+
+        if data.get('result') == 'error':
+            api_error_type = data.get('error-type', 'unknown-api-error')
+            if api_error_type == 'quota-reached':
+                self._note_quota_reset(headers)
+            message_template, message_args = API_ERROR_MESSAGES.get(api_error_type), ()
+            if message_template is None:
+                message_template, message_args = DEFAULT_API_ERROR_MESSAGE, (api_error_type.replace('-', ' ').title(),)
+
+            raise ExchangeRateAPIError(
+                message_template=message_template,
+                api_error_type=api_error_type,
+                http_status_code=status_code,
+                details=data,
+                message_args=message_args
+            )
+
+        # Handle cases where the 'result' key is neither 'success' nor 'error'
+        raise ExchangeRateAPIError(
+            message_template="Unexpected 'result' value in API response: %s.",
+            http_status_code=status_code,
+            api_error_type="unexpected-response-format",
+            details=data,
+            message_args=(data.get('result'),)
+        )
+
+    def _store_codes(self, data: dict) -> None:
+        self._supported_codes = {code for code, _ in data['supported_codes']}
+
+    def _reject_unsupported(self, currency_codes: typing.Iterable[str]) -> None:
+        """
+        Raises ExchangeRateAPIError with api_error_type 'unsupported-code' for the first
+        code that isn't in the loaded set of supported codes.
+        """
+        for code in currency_codes:
+            if code not in self._supported_codes:
+                raise self._unsupported_code_error(code)
+
+    @staticmethod
+    def _unsupported_code_error(code: str) -> ExchangeRateAPIError:
+        return ExchangeRateAPIError(
+            message_template=API_ERROR_MESSAGES["unsupported-code"],
+            api_error_type="unsupported-code",
+            details={"currency_code": code}
+        )
+
+    def _select_rates(self, rates: typing.Mapping[str, float],
+                      currency_codes: typing.Iterable[str]) -> typing.Dict[str, float]:
+        """
+        Picks the requested codes out of a rates table. A code listed by /codes but missing
+        from the table raises the same 'unsupported-code' ExchangeRateAPIError.
+        """
+        selected = {}
+        for code in currency_codes:
+            rate = rates.get(code)
+            if rate is None:
+                raise self._unsupported_code_error(code)
+            selected[code] = rate
+        return selected
+
+    def _cached_pair_rate(self, base_currency: str, target_currency: str) -> typing.Optional[float]:
+        """
+        Answers a single-pair lookup from a fresh full rates table for the base, if one is cached.
+        Returns None when there is no such table or it lacks the target, so the caller asks /pair.
+        """
+        all_rates = self._get_cached(f'/latest/{base_currency}')
+        if all_rates is not None:
+            return all_rates['conversion_rates'].get(target_currency)
+        return None
@@ -1,96 +1,146 @@
+import typing
+
+import orjson
 import requests
-from requests.exceptions import RequestException, HTTPError, Timeout, ConnectionError
-# Assuming a custom exception class as before
-from exceptions import ExchangeRateAPIError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from requests.exceptions import (RequestException, HTTPError, Timeout, ConnectionError, InvalidURL, InvalidSchema,
+                                 MissingSchema)
+from base_converter import BaseCurrencyConverter, _INVALID_URL_MESSAGE
+
+
+class _NoQuotaRetry(Retry):
+    # urllib3 retries any 413/429/503 that carries Retry-After even when it isn't in status_forcelist;
+    # 429 means the quota is exhausted, which waiting out inside the request can't fix
+    RETRY_AFTER_STATUS_CODES = frozenset([503])
 
 
-class CurrencyConverter:
-    # Assuming BASE_URL and api_key are defined in __init__
-    BASE_URL = "https://v6.exchangerate-api.com/v6/"
+class CurrencyConverter(BaseCurrencyConverter):
+    _EXC_TO_TYPE = (
+        (HTTPError, "http-error", None),
+        (Timeout, "timeout", "The request to the currency API timed out."),
+        (ConnectionError, "network-error", "A network connection error occurred to the currency API."),
+        # These are also ValueErrors, so they must come before the JSON decoding row
+        ((InvalidURL, InvalidSchema, MissingSchema), "invalid-url", _INVALID_URL_MESSAGE),
+        (ValueError, "json-decode-error", "Failed to decode the JSON response from the API."),  # Catches JSONDecodeError
+    )
 
     def __init__(self, api_key: str):
-        self.api_key = api_key
+        super().__init__(api_key)
+        # A persistent session keeps the TCP/TLS connection alive between calls
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            # Transient 5xx failures are retried with backoff, waiting out any Retry-After the server sends.
+            # 429 is left out: an exhausted quota is reported as 'quota-reached' at once instead of sleeping.
+            # connect=0 fails DNS errors, refused connections and connect timeouts at once, since backing
+            # off won't fix them. read=False re-raises read timeouts at once as Timeout rather than
+            # retrying them and surfacing a ConnectionError; raise_on_status=False hands the final
+            # response back so raise_for_status() classifies it.
+            max_retries=_NoQuotaRetry(total=5, connect=0, read=False, backoff_factor=0.5,
+                                      status_forcelist=(500, 502, 503, 504), respect_retry_after_header=True,
+                                      allowed_methods=frozenset(['GET']), raise_on_status=False)
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def close(self) -> None:
+        """
+        Closes the underlying HTTP session and releases pooled connections.
+        """
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _make_api_request(self, endpoint: str) -> dict:
         """
         Internal helper to make API requests. Raises ExchangeRateAPIError on any failure.
         Consolidates error handling and redacts sensitive information.
         """
-        full_url = f'{self.BASE_URL}{self.api_key}{endpoint}'
+        cached = self._get_cached(endpoint)
+        if cached is not None:
+            return cached
+
+        stale_entry, headers = self._prepare_request(endpoint)
+        full_url = self._url_prefix + endpoint
 
         try:
-            response = requests.get(full_url, timeout=10)
+            response = self._session.get(full_url, headers=headers, timeout=self.REQUEST_TIMEOUT_SECONDS)
+            # 304 Not Modified: the cached copy is still current and there is no body to parse
+            if response.status_code == 304 and stale_entry is not None:
+                return self._revalidated(endpoint, stale_entry, response.headers)
             # This is the first gate: raises HTTPError for 4xx/5xx responses
             response.raise_for_status()
-            # The second gate: raises ValueError/JSONDecodeError if response isn't JSON
-            data = response.json()
+            # The second gate: raises orjson.JSONDecodeError (a ValueError) if response isn't JSON.
+            # Parsing the raw bytes skips requests' charset detection and the slower stdlib decoder.
+            data = orjson.loads(response.content)
 
         except (RequestException, ValueError) as e:
             # This single block now catches all network, HTTP, and JSON decoding errors
-            api_error_type = "unknown-request-error"
-            user_message = f"An unexpected error occurred: {e}"
-            status_code = e.response.status_code if hasattr(e, 'response') and e.response else None
-
-            if isinstance(e, HTTPError):
-                api_error_type = "http-error"
-                user_message = f"API request failed with HTTP Error {status_code}: {e.response.reason}."
-                if status_code == 404:
-                    user_message = "The requested currency or API endpoint was not found."
-            elif isinstance(e, Timeout):
-                api_error_type = "timeout"
-                user_message = "The request to the currency API timed out."
-            elif isinstance(e, ConnectionError):
-                api_error_type = "network-error"
-                user_message = "A network connection error occurred to the currency API."
-            elif isinstance(e, ValueError): # Catches JSONDecodeError
-                api_error_type = "json-decode-error"
-                user_message = "Failed to decode the JSON response from the API."
-
-            redacted_url = full_url.replace(self.api_key, '***REDACTED_API_KEY***')
-            details = {"requested_url_redacted": redacted_url}
-
-            raise ExchangeRateAPIError(
-                message=user_message,
-                api_error_type=api_error_type,
-                http_status_code=status_code,
-                details=details
-            ) from e
+            # A Response is falsy for 4xx/5xx, so compare against None explicitly
+            error_response = getattr(e, 'response', None)
+            if error_response is not None:
+                raise self._request_error(endpoint, e, error_response.status_code, error_response.reason,
+                                          error_response.headers) from e
+            raise self._request_error(endpoint, e, None, None, None) from e
 
         # --- If we get here, the request was successful and we have valid JSON ---
         # Now, we handle the API's own specific error messages.
-        if data.get('result') == 'success':
-            return data
-
-        if data.get('result') == 'error':
-            api_error_type = data.get('error-type', 'unknown-api-error')
-            error_messages = {
-                "unsupported-code": "Currency code not supported by API. Please check the currency code.",
-                "invalid-key": "Invalid API key provided. Please check your API key.",
-                "quota-reached": "API quota reached. Please try again later or upgrade your plan."
-            }
-            user_message = error_messages.get(api_error_type, f"Currency API returned an unhandled error: {api_error_type.replace('-', ' ').title()}.")
-
-            raise ExchangeRateAPIError(
-                message=user_message,
-                api_error_type=api_error_type,
-                http_status_code=response.status_code,
-                details=data
-            )
-
-        # Handle cases where the 'result' key is neither 'success' nor 'error'
-        raise ExchangeRateAPIError(
-            message=f"Unexpected 'result' value in API response: {data.get('result')}.",
-            http_status_code=response.status_code,
-            api_error_type="unexpected-response-format",
-            details=data
-        )
-    def get_exchange_rate(self, base_currency: str , target_currency: str) -> float:
-            """
-            Fetches the exchange rate. Raises ExchangeRateAPIError on failure.
-            """
-    pass
-    # endpoint = f'/latest/{base_currency.upper()}'
-    # data = self._make.api
+        return self._handle_api_response(endpoint, data, response.status_code, response.headers)
+
+    def _ensure_codes(self) -> None:
+        """
+        Loads the set of currency codes supported by the API. Currencies rarely
+        change, so the set is kept for the lifetime of the converter.
+        """
+        if self._supported_codes is None:
+            self._store_codes(self._make_api_request('/codes'))
+
+    def _check_supported(self, *currency_codes: str) -> None:
+        """
+        Rejects currency codes that the API does not support without making a
+        request for them. Raises ExchangeRateAPIError with api_error_type 'unsupported-code'.
+        """
+        self._ensure_codes()
+        self._reject_unsupported(currency_codes)
+
+    def get_exchange_rate(self, base_currency: str, target_currency: str) -> float:
+        """
+        Fetches the exchange rate. Raises ExchangeRateAPIError on failure.
+        """
+        base_currency, target_currency = base_currency.upper(), target_currency.upper()
+        self._check_supported(base_currency, target_currency)
+        rate = self._cached_pair_rate(base_currency, target_currency)
+        if rate is not None:
+            return rate
+        data = self._make_api_request(f'/pair/{base_currency}/{target_currency}')
+        return data['conversion_rate']
+
+    def get_all_rates(self, base_currency: str) -> typing.Dict[str, float]:
+        """
+        Fetches the rates from base_currency to every supported currency.
+        Raises ExchangeRateAPIError on failure.
+        """
+        base_currency = base_currency.upper()
+        self._check_supported(base_currency)
+        data = self._make_api_request(f'/latest/{base_currency}')
+        # A copy, so callers can't alter the cached table that later lookups read from
+        return dict(data['conversion_rates'])
+
+    def get_exchange_rates(self, base_currency: str, target_currencies: typing.Iterable[str]) -> typing.Dict[str, float]:
+        """
+        Fetches the rates from base_currency to each of target_currencies with a single
+        /latest request, keyed by upper-cased currency code. Raises ExchangeRateAPIError on failure.
+        """
+        target_currencies = [code.upper() for code in target_currencies]
+        self._check_supported(*target_currencies)
+        rates = self.get_all_rates(base_currency)
+        return self._select_rates(rates, target_currencies)
 
 if __name__ == "__main__":
     import os
@@ -99,6 +149,85 @@ if __name__ == "__main__":
     from currency_converter import CurrencyConverter
     from exceptions import ExchangeRateAPIError
 
+    # --- Offline Checks (local stub server, no API key needed) ---
+    # These cover the stateful paths (TTL cache, 304 revalidation, quota fast-fail, timeouts)
+    # that the live-API cases below can't trigger on demand. The async converter has its own
+    # in async_currency_converter.py.
+    import time
+    from stub_api_server import StubAPIServer, OfflineChecks
+
+    print("\n--- Offline checks against a local stub server ---")
+    offline = OfflineChecks()
+
+    with StubAPIServer() as stub:
+        stub_converter = CurrencyConverter("OFFLINE_KEY")
+        stub_converter.BASE_URL = stub.base_url
+
+        # [O1] A fresh cached response is served without another request
+        print("\n[O1] Fetching USD rates twice within the TTL...")
+        stub_converter.get_all_rates("USD")
+        stub_converter.get_all_rates("usd")
+        offline.check("second lookup served from cache", stub.hits_for('/latest/USD') == [200],
+                      f"hits: {stub.hits_for('/latest/USD')}")
+
+        # [O2] Single pairs are answered from the cached /latest table, and callers can't corrupt it
+        print("\n[O2] Looking up USD->GBP after the USD table is cached...")
+        stub_converter.get_all_rates("USD")["GBP"] = 123
+        rate = stub_converter.get_exchange_rate("usd", "gbp")
+        offline.check("pair read from cached table", rate == 0.8 and not stub.hits_for('/pair/USD/GBP'), f"rate: {rate}")
+        rate = stub_converter.get_exchange_rate("eur", "gbp")
+        offline.check("uncached pair uses /pair", rate == 0.88 and stub.hits_for('/pair/EUR/GBP') == [200], f"rate: {rate}")
+
+        # [O3] After the TTL expires, the stale entry is revalidated and a 304 keeps the cached data
+        print("\n[O3] Revalidating the USD table once its TTL has expired...")
+        stub_converter.CACHE_TTL_SECONDS = 0
+        data = stub_converter._make_api_request("/latest/USD")
+        stub_converter.CACHE_TTL_SECONDS = CurrencyConverter.CACHE_TTL_SECONDS
+        offline.check("stale entry revalidated with 304", stub.hits_for('/latest/USD') == [200, 304]
+                      and data["conversion_rates"]["EUR"] == 0.9, f"hits: {stub.hits_for('/latest/USD')}")
+        offline.check("304 restarted the TTL", stub_converter._get_cached("/latest/USD") is data)
+
+        # [O4] A read timeout is reported as a timeout after a single attempt
+        print("\n[O4] Requesting an endpoint that responds slower than the timeout...")
+        stub_converter.REQUEST_TIMEOUT_SECONDS = 0.3
+        try:
+            stub_converter._make_api_request("/slow")
+            offline.check("read timeout classified", False, "no error raised")
+        except ExchangeRateAPIError as e:
+            offline.check("read timeout classified", e.api_error_type == "timeout", f"type: {e.api_error_type}")
+        stub_converter.REQUEST_TIMEOUT_SECONDS = CurrencyConverter.REQUEST_TIMEOUT_SECONDS
+
+        # [O5] Codes missing from /codes are rejected locally, without a rate request
+        print("\n[O5] Looking up rates for an unsupported currency ('XXX')...")
+        requests_before = len(stub.hits)
+        for label, lookup in (("pair", lambda: stub_converter.get_exchange_rate("usd", "xxx")),
+                              ("batch", lambda: stub_converter.get_exchange_rates("usd", ["eur", "xxx"])),
+                              ("base", lambda: stub_converter.get_all_rates("xxx"))):
+            try:
+                lookup()
+                offline.check(f"{label} lookup rejected locally", False, "no error raised")
+            except ExchangeRateAPIError as e:
+                offline.check(f"{label} lookup rejected locally", e.api_error_type == "unsupported-code"
+                              and e.details == {"currency_code": "XXX"}, f"type: {e.api_error_type}")
+        offline.check("no request made for unsupported codes", len(stub.hits) == requests_before,
+                      f"requests: {stub.hits[requests_before:]}")
+        offline.check("/codes fetched only once", stub.hits_for('/codes') == [200], f"hits: {stub.hits_for('/codes')}")
+
+        # [O6] A 429 is reported as quota-reached at once, and later calls fail fast without a request
+        print("\n[O6] Requesting EUR rates while the quota is exhausted...")
+        for attempt in ("first", "second"):
+            started = time.monotonic()
+            try:
+                stub_converter.get_all_rates("EUR")
+                offline.check(f"{attempt} call raised quota-reached", False, "no error raised")
+            except ExchangeRateAPIError as e:
+                offline.check(f"{attempt} call raised quota-reached", e.api_error_type == "quota-reached"
+                              and time.monotonic() - started < 0.5, f"type: {e.api_error_type}, status: {e.http_status_code}")
+        offline.check("429 was not retried", stub.hits_for('/latest/EUR') == [429], f"hits: {stub.hits_for('/latest/EUR')}")
+        stub_converter.close()
+
+    offline.finish()
+
     print("\n--- Testing _make_api_request functionality with refined error handling ---")
 
     api_key_from_env = os.getenv("EXCHANGE_API")
@@ -1,16 +1,117 @@
 import typing
+import warnings
+
+# User-facing messages for the 'error-type' values reported by ExchangeRate-API
+API_ERROR_MESSAGES = {
+    "unsupported-code": "Currency code not supported by API. Please check the currency code.",
+    "invalid-key": "Invalid API key provided. Please check your API key.",
+    "quota-reached": "API quota reached. Please try again later or upgrade your plan."
+}
+DEFAULT_API_ERROR_MESSAGE = "Currency API returned an unhandled error: %s."
+
+
 class ExchangeRateAPIError(Exception):
 
     """
     Base exception for all external API errors related to ExchangeRate-API.
     Details from the API response (error type, status code, full details)
     are passed as attributes for logging or specific handling.
+    The message is only %-formatted from message_template and message_args
+    when it is actually read, so callers that just inspect api_error_type
+    never pay for building it.
     """
+    __slots__ = ('api_error_type', 'http_status_code', 'details', 'message_args')
 
-    def __init__(self, message: str, api_error_type: typing.Optional[str]= None, http_status_code: typing.Optional[int] = None,
-                 details: typing.Optional[dict] = None):
-        super().__init__(message)
+    def __init__(self, message_template: typing.Optional[str] = None, api_error_type: typing.Optional[str]= None,
+                 http_status_code: typing.Optional[int] = None, details: typing.Optional[dict] = None,
+                 message_args: tuple = (), message: typing.Optional[str] = None):
+        if message is not None:
+            # Pre-formatted messages from before message_template existed
+            warnings.warn("ExchangeRateAPIError(message=...) is deprecated; use message_template",
+                          DeprecationWarning, stacklevel=2)
+            message_template, message_args = message, ()
+        if message_template is None:
+            raise TypeError("ExchangeRateAPIError() missing required argument: 'message_template'")
+        super().__init__(message_template)
         self.api_error_type = api_error_type
         self.http_status_code = http_status_code
         self.details = details
-        self.message = message
\ No newline at end of file
+        self.message_args = message_args
+
+    @property
+    def message_template(self) -> str:
+        # Exception.args already holds the template, so it isn't stored a second time
+        return self.args[0]
+
+    @property
+    def message(self) -> str:
+        if not self.message_args:
+            return self.message_template
+        return self.message_template % self.message_args
+
+    def __str__(self) -> str:
+        return self.message
+
+    def __repr__(self) -> str:
+        # args[0] is the unformatted template, so show the filled-in message instead
+        return f"{type(self).__name__}({self.message!r})"
+
+    def __reduce__(self):
+        # Slot attributes aren't part of the default BaseException pickle state
+        return (self.__class__, (self.message_template, self.api_error_type, self.http_status_code,
+                                 self.details, self.message_args))
+
+
+if __name__ == "__main__":
+    # --- Offline Checks (no network needed) ---
+    from stub_api_server import OfflineChecks
+
+    print("\n--- Offline checks for ExchangeRateAPIError ---")
+    offline = OfflineChecks()
+
+    class CountingArg:
+        """Counts how often the message is actually formatted."""
+        formatted = 0
+
+        def __str__(self):
+            CountingArg.formatted += 1
+            return "Boom"
+
+    # [E1] The message is only formatted when it is read
+    print("\n[E1] Building an error and reading only api_error_type...")
+    error = ExchangeRateAPIError("API request failed with HTTP Error %s: %s.", "http-error", 500,
+                                 message_args=(500, CountingArg()))
+    offline.check("not formatted on construction", error.api_error_type == "http-error" and CountingArg.formatted == 0)
+    offline.check("formatted on read", str(error) == "API request failed with HTTP Error 500: Boom."
+                  and error.message == str(error), f"message: {error.message}")
+    offline.check("repr shows the formatted message",
+                  repr(error) == "ExchangeRateAPIError('API request failed with HTTP Error 500: Boom.')", repr(error))
+
+    # [E2] message= still works as a deprecated, pre-formatted alias
+    print("\n[E2] Building an error with the deprecated message= keyword...")
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        legacy = ExchangeRateAPIError(message="100% of quota used", api_error_type="quota-reached")
+    offline.check("DeprecationWarning emitted", any(issubclass(w.category, DeprecationWarning) for w in caught))
+    offline.check("message= is not %-formatted", str(legacy) == "100% of quota used", str(legacy))
+    try:
+        ExchangeRateAPIError()
+        offline.check("missing message rejected", False, "no error raised")
+    except TypeError:
+        offline.check("missing message rejected", True)
+
+    # [E3] Only the slot attributes are stored, and pickling keeps them
+    print("\n[E3] Checking __slots__ storage and a pickle round trip...")
+    import pickle
+    offline.check("attributes live in slots", not vars(error)
+                  and all(hasattr(error, name) for name in ExchangeRateAPIError.__slots__), f"__dict__: {vars(error)}")
+    offline.check("message_template read from args", error.message_template == error.args[0])
+    restored = pickle.loads(pickle.dumps(ExchangeRateAPIError("Currency API returned an unhandled error: %s.",
+                                                              "odd-error", 400, {"result": "error"}, ("Odd Error",))))
+    offline.check("pickle round trip keeps every field",
+                  (restored.message, restored.api_error_type, restored.http_status_code, restored.details)
+                  == ("Currency API returned an unhandled error: Odd Error.", "odd-error", 400, {"result": "error"}),
+                  repr(restored))
+
+    offline.finish()
+    print("\n--- Offline checks complete ---")
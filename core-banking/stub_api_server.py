@@ -0,0 +1,92 @@
+import json
+import threading
+import time
+import typing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubAPIServer:
+    """
+    Local stand-in for ExchangeRate-API used by the offline checks in the converters'
+    demo blocks. Serves canned responses on 127.0.0.1 and records every request it answers.
+
+    Endpoints (after /v6/<key>): /codes, /latest/USD (ETag "v1", answers 304 to
+    If-None-Match: "v1"), /pair/EUR/GBP, /latest/EUR (always 429) and /slow (sleeps 1s).
+    """
+    SUPPORTED_CODES = [["USD", "US Dollar"], ["EUR", "Euro"], ["GBP", "Pound Sterling"]]
+    USD_RATES = {"USD": 1, "EUR": 0.9, "GBP": 0.8}
+
+    def __init__(self):
+        self.hits: typing.List[typing.Tuple[str, int]] = []  # (endpoint, status) per answered request
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, endpoint, status, body=None, headers=None):
+                payload = json.dumps(body).encode() if body is not None else b''
+                stub.hits.append((endpoint, status))
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                endpoint = '/' + self.path.split('/', 3)[-1]
+                if endpoint == '/codes':
+                    self._reply(endpoint, 200, {"result": "success", "supported_codes": stub.SUPPORTED_CODES})
+                elif endpoint == '/latest/USD':
+                    if self.headers.get('If-None-Match') == '"v1"':
+                        self._reply(endpoint, 304, headers={'ETag': '"v1"'})
+                    else:
+                        self._reply(endpoint, 200, {"result": "success", "conversion_rates": stub.USD_RATES},
+                                    {'ETag': '"v1"', 'Last-Modified': 'Mon, 12 Oct 2026 00:00:00 GMT'})
+                elif endpoint == '/pair/EUR/GBP':
+                    self._reply(endpoint, 200, {"result": "success", "conversion_rate": 0.88})
+                elif endpoint == '/latest/EUR':
+                    self._reply(endpoint, 429, headers={'Retry-After': '1', 'x-ratelimit-reset': '60'})
+                elif endpoint == '/slow':
+                    time.sleep(1)
+                    self._reply(endpoint, 200, {"result": "success"})
+                else:
+                    self._reply(endpoint, 404)
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}/v6/"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def hits_for(self, endpoint: str) -> typing.List[int]:
+        """
+        Returns the status codes answered for an endpoint, in order.
+        """
+        return [status for path, status in self.hits if path == endpoint]
+
+
+class OfflineChecks:
+    """
+    Prints SUCCESS/FAILED lines in the style of the demo test cases and exits non-zero
+    from finish() if any check failed.
+    """
+
+    def __init__(self):
+        self.failures: typing.List[str] = []
+
+    def check(self, label: str, passed: bool, detail: str = "") -> None:
+        print(f"{'SUCCESS' if passed else 'FAILED'}: {label}{' - ' + detail if detail else ''}")
+        if not passed:
+            self.failures.append(label)
+
+    def finish(self) -> None:
+        if self.failures:
+            print(f"\nOFFLINE CHECKS FAILED: {', '.join(self.failures)}")
+            exit(1)